@@ -1,11 +1,12 @@
 """Admin-only HTTP endpoints."""
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel, Field
 
 from backend.api import dependencies
-from backend.services import admin_service
+from backend.config import APP_SETTINGS
+from backend.services import admin_service, rate_limit_service
 
 router = APIRouter(prefix="/api/admin", tags=["admin"])
 
@@ -41,3 +42,26 @@ async def delete_comment(payload: DeleteCommentPayload, admin=Depends(dependenci
 async def moderation_comments(include_deleted: bool = True, admin=Depends(dependencies.get_current_admin)):
     comments = admin_service.moderation_feed(include_deleted=include_deleted)
     return {"items": comments}
+
+
+@router.get("/archived_comments")
+async def archived_comments(
+    post_id: str = Query(..., min_length=1, max_length=255),
+    admin=Depends(dependencies.get_current_admin),
+):
+    return {"items": admin_service.archived_feed(post_id)}
+
+
+# 普通 def：FastAPI 会放进线程池执行，阻塞的 pyodbc 批量搬迁不会卡住事件循环
+@router.post("/archive")
+def run_archiver(admin=Depends(dependencies.get_current_admin)):
+    try:
+        archived = admin_service.run_archiver()
+    except RuntimeError as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc)) from exc
+    return {"archived": archived}
+
+
+@router.get("/rate_limits")
+async def rate_limit_stats(admin=Depends(dependencies.get_current_admin)):
+    return {"enabled": APP_SETTINGS["rate_limit_enabled"], "actions": rate_limit_service.rate_limiter.stats()}
@@ -26,7 +26,13 @@ async def list_post_comments(
     return {"items": comments}
 
 
-@router.post("")
+@router.get("/archive")
+async def list_archived_post_comments(post_id: str = Query(..., min_length=1, max_length=255)):
+    comments = comment_service.list_archived_comments(post_id)
+    return {"items": comments}
+
+
+@router.post("", dependencies=[Depends(dependencies.rate_limit("comment", require_user=True))])
 async def submit_comment(payload: CommentCreate, user=Depends(dependencies.get_current_user)):
     if not payload.content.strip():
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Empty comments are not allowed")
@@ -42,7 +48,7 @@ async def submit_comment(payload: CommentCreate, user=Depends(dependencies.get_c
     return comment
 
 
-@router.post("/{comment_id}/like")
+@router.post("/{comment_id}/like", dependencies=[Depends(dependencies.rate_limit("like", require_user=True))])
 async def toggle_like(
     comment_id: int = Path(..., ge=1),
     user=Depends(dependencies.get_current_user),
@@ -1,11 +1,19 @@
 """Reusable FastAPI dependencies."""
 from __future__ import annotations
 
+import logging
 from typing import Optional
 
-from fastapi import Depends, Header, HTTPException, status
+from fastapi import Depends, Header, HTTPException, Request, status
 
-from backend.services import auth_service, user_service
+from backend.config import APP_SETTINGS
+from backend.services import auth_service, rate_limit_service, user_service
+
+logger = logging.getLogger(__name__)
+
+# 取不到客户端地址时所有请求共用这一个 IP 桶，而不是悄悄跳过 IP 维度
+UNKNOWN_CLIENT_IP = "unknown"
+_warned_unknown_ip = False
 
 
 async def get_bearer_token(authorization: str = Header(...)) -> str:
@@ -48,3 +56,54 @@ async def get_optional_user(authorization: Optional[str] = Header(default=None))
     user["role"] = session["role"]
     user["token"] = token
     return user
+
+
+def _warn_unknown_ip(reason: str) -> None:
+    global _warned_unknown_ip
+    if not _warned_unknown_ip:
+        _warned_unknown_ip = True
+        logger.warning("%s; all such requests share the '%s' per-IP rate limit bucket", reason, UNKNOWN_CLIENT_IP)
+
+
+def _client_ip(request: Request) -> str:
+    # 代理只会在 X-Forwarded-For 末尾追加，左侧的内容客户端可以随意伪造；
+    # 因此从右往左数第 N 个（N = 可信代理层数）才是可信代理看到的真实客户端地址。
+    hops = APP_SETTINGS["rate_limit_trusted_proxies"]
+    if hops > 0:
+        forwarded = [part.strip() for part in request.headers.get("x-forwarded-for", "").split(",") if part.strip()]
+        if forwarded:
+            return forwarded[-min(hops, len(forwarded))]
+        # 配置了可信代理却没有 X-Forwarded-For，说明代理没有设置该头或请求绕过了代理
+        _warn_unknown_ip("RATE_LIMIT_TRUSTED_PROXIES is set but the request has no X-Forwarded-For header")
+        return UNKNOWN_CLIENT_IP
+    if request.client is None:
+        _warn_unknown_ip("Client address unavailable (e.g. unix socket)")
+        return UNKNOWN_CLIENT_IP
+    return request.client.host
+
+
+def rate_limit(action: str, require_user: bool = False):
+    """在任何数据库访问之前按用户 / IP / 全局令牌桶放行，超限直接返回 429。
+
+    只读取内存中的会话来确定用户，因此需要放在路由的 dependencies 中先于 get_current_user 执行。
+    require_user=True 时没有有效会话的请求直接 401，不消耗 IP / 全局令牌，
+    避免匿名洪水把登录用户共享的全局桶耗尽。
+    """
+
+    async def dependency(request: Request, authorization: Optional[str] = Header(default=None)) -> None:
+        user_id = None
+        if authorization and authorization.lower().startswith("bearer "):
+            session = auth_service.session_manager.get_session(authorization.split(" ", 1)[1].strip())
+            if session:
+                user_id = session["user_id"]
+        if require_user and user_id is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token")
+        retry_after = rate_limit_service.rate_limiter.check(action, user_id=user_id, client_ip=_client_ip(request))
+        if retry_after:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests, please slow down",
+                headers={"Retry-After": rate_limit_service.retry_after_header(retry_after)},
+            )
+
+    return dependency
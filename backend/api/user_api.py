@@ -1,9 +1,10 @@
 """User-facing HTTP endpoints."""
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, Field
 
+from backend.api import dependencies
 from backend.services import auth_service, user_service
 
 router = APIRouter(prefix="/api/users", tags=["users"])
@@ -14,7 +15,7 @@ class Credentials(BaseModel):
     password: str = Field(min_length=3, max_length=128)
 
 
-@router.post("/register")
+@router.post("/register", dependencies=[Depends(dependencies.rate_limit("register"))])
 async def register_user(payload: Credentials):
     try:
         user = user_service.create_user(payload.username.strip(), payload.password.strip())
@@ -23,7 +24,7 @@ async def register_user(payload: Credentials):
     return {"id": user["id"], "username": user["username"], "role": user["role"]}
 
 
-@router.post("/login")
+@router.post("/login", dependencies=[Depends(dependencies.rate_limit("login"))])
 async def login_user(payload: Credentials):
     user = user_service.validate_credentials(payload.username.strip(), payload.password.strip())
     if not user:
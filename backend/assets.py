@@ -0,0 +1,88 @@
+"""Fingerprinted, precompressed builds of the embeddable widget script."""
+from __future__ import annotations
+
+import hashlib
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from backend import compression
+
+STATIC_ROOT = Path(__file__).resolve().parent / "static"
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+class FingerprintedAsset:
+    def __init__(self, source: Path) -> None:
+        self.source = source
+        self.body = source.read_bytes()
+        self.digest = hashlib.sha256(self.body).hexdigest()[:12]
+        self.filename = f"{source.stem}.{self.digest}{source.suffix}"
+        # 构建期一次性用最高等级压缩好，请求时只做查表
+        self.encoded: Dict[str, bytes] = {
+            encoding: compression.compress(self.body, encoding, static=True)
+            for encoding in compression.supported_encodings()
+        }
+
+    def etag(self, encoding: Optional[str]) -> str:
+        # 每种 Content-Encoding 是不同的表示，强 ETag 不能共用
+        suffixes = {None: "", "gzip": "-gz", "br": "-br"}
+        return f'"{self.digest}{suffixes[encoding]}"'
+
+    def variant(self, accept_encoding: Optional[str]) -> Tuple[Optional[str], bytes]:
+        encoding = compression.choose_encoding(accept_encoding, list(self.encoded))
+        if encoding is None:
+            return None, self.body
+        return encoding, self.encoded[encoding]
+
+    def write(self, out_dir: Path) -> List[Path]:
+        out_dir.mkdir(parents=True, exist_ok=True)
+        written = [out_dir / self.filename]
+        written[0].write_bytes(self.body)
+        suffixes = {"gzip": ".gz", "br": ".br"}
+        for encoding, payload in self.encoded.items():
+            path = out_dir / f"{self.filename}{suffixes[encoding]}"
+            path.write_bytes(payload)
+            written.append(path)
+        return written
+
+
+widget_asset = FingerprintedAsset(STATIC_ROOT / "comments.js")
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """与 Starlette StaticFiles 一致：If-None-Match 可以是列表、弱校验 W/ 形式或 *。"""
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in [tag[2:] if tag.startswith("W/") else tag for tag in tags]
+
+
+def widget_url(api_base: str) -> str:
+    return f"{api_base.rstrip('/')}/static/{widget_asset.filename}"
+
+
+def loader_script(api_base: str) -> str:
+    """短缓存的引导脚本：主题只需引用固定的 /static/loader.js，由它注入当前指纹版本的 comments.js。
+
+    api_base 必须来自配置而不是请求的 Host 头，否则共享缓存可能被伪造的 Host 污染。
+    """
+    return (
+        "(function(){var s=document.createElement('script');"
+        f"s.src={json.dumps(widget_url(api_base))};s.defer=true;"
+        "document.head.appendChild(s);})();\n"
+    )
+
+
+def main() -> None:
+    """把带指纹的 comments.js 及其 .gz / .br 写到 static/dist，供直接拷进 Hexo 主题或 CDN。"""
+    out_dir = Path(sys.argv[1]) if len(sys.argv) > 1 else STATIC_ROOT / "dist"
+    for path in widget_asset.write(out_dir):
+        print(f"{path}  {path.stat().st_size} bytes")
+    print(f'<script src="/js/{widget_asset.filename}" defer></script>')
+
+
+if __name__ == "__main__":
+    main()
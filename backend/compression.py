@@ -0,0 +1,174 @@
+"""Content-Encoding negotiation for API payloads and precompressed static assets."""
+from __future__ import annotations
+
+import gzip
+from typing import Dict, List, Optional
+
+from backend.config import APP_SETTINGS
+
+try:  # brotli 是可选依赖，缺失时只协商 gzip
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript")
+
+
+def supported_encodings() -> List[str]:
+    return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+def choose_encoding(accept_encoding: Optional[str], available: Optional[List[str]] = None) -> Optional[str]:
+    """按 Accept-Encoding 的 q 值挑选编码，q 相同时优先 br；没有可用编码返回 None。"""
+    if not accept_encoding:
+        return None
+    available = supported_encodings() if available is None else available
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[token] = q
+
+    best, best_q = None, 0.0
+    for encoding in available:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(body: bytes, encoding: str, static: bool = False) -> bytes:
+    """动态响应用较低等级换延迟；static=True 用于构建期的预压缩，取最高压缩率。"""
+    if encoding == "br":
+        quality = 11 if static else APP_SETTINGS["compression_brotli_quality"]
+        return brotli.compress(body, quality=quality)
+    if encoding == "gzip":
+        level = 9 if static else APP_SETTINGS["compression_gzip_level"]
+        return gzip.compress(body, compresslevel=level, mtime=0)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+def _weaken_etag(headers):
+    """压缩后的字节与原始文件不同，强 ETag 不能沿用；改成弱 ETag，条件请求仍可按弱比较命中。"""
+    weakened = []
+    for name, value in headers:
+        if name == b"etag" and not value.startswith(b"W/"):
+            value = b"W/" + value
+        weakened.append((name, value))
+    return weakened
+
+
+class CompressionMiddleware:
+    """压缩超过阈值的一次性响应体（JSON 评论树等）；流式响应和已编码的响应原样透传。"""
+
+    def __init__(self, app, minimum_size: int) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept_encoding = None
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+        encoding = choose_encoding(accept_encoding)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        passthrough = False
+
+        async def send_wrapper(message) -> None:
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            headers = start_message["headers"]
+            body = message.get("body", b"")
+            if start_message["status"] == 304 and not any(name == b"content-encoding" for name, _ in headers):
+                # 304 对应的是客户端缓存的压缩版本，ETag 要和压缩响应里的保持一致
+                await send({**start_message, "headers": _weaken_etag(headers)})
+                await send(message)
+                passthrough = True
+                return
+            if message.get("more_body", False) or not self._should_compress(headers, body):
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            compressed = compress(body, encoding)
+            new_headers = [
+                (name, value) for name, value in _weaken_etag(headers) if name not in (b"content-length", b"vary")
+            ]
+            vary = [value for name, value in headers if name == b"vary"]
+            new_headers.append((b"vary", b", ".join(vary + [b"Accept-Encoding"])))
+            new_headers.append((b"content-encoding", encoding.encode("latin-1")))
+            new_headers.append((b"content-length", str(len(compressed)).encode("latin-1")))
+            await send({**start_message, "headers": new_headers})
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _should_compress(self, headers, body: bytes) -> bool:
+        if len(body) < self.minimum_size:
+            return False
+        content_type = b""
+        for name, value in headers:
+            if name == b"content-encoding":
+                return False
+            if name == b"content-type":
+                content_type = value
+        return content_type.decode("latin-1").startswith(COMPRESSIBLE_TYPES)
+
+
+def _measure() -> None:
+    """打印典型评论树在不同编码下的传输字节数：python -m backend.compression"""
+    import datetime
+    import json
+    import random
+
+    sentences = ["写得很清楚，收藏了。", "请问这个配置在 Windows 上也适用吗？", "Thanks, this fixed my build!", "同问，期待后续。"]
+    started = datetime.datetime(2025, 1, 1, 12, 0, 0)
+    rng = random.Random(0)
+    for count in (5, 50, 500):
+        items = []
+        for i in range(count):
+            items.append({
+                "id": i + 1,
+                "post_id": "https://example.com/2025/01/01/hello-world/",
+                "user_id": i % 17 + 1,
+                "username": f"reader{i % 17}",
+                "content": " ".join(rng.choice(sentences) for _ in range(rng.randint(1, 4))) + f" #{rng.randint(1, 99999)}",
+                "created_at": (started + datetime.timedelta(minutes=i)).isoformat(),
+                "is_deleted": False,
+                "parent_comment_id": rng.randint(1, i) if i and rng.random() < 0.4 else None,
+                "like_count": i % 7,
+                "liked_by_viewer": False,
+                "is_archived": False,
+                "replies": [],
+            })
+        body = json.dumps({"items": items}, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        sizes = ", ".join(f"{encoding} {len(compress(body, encoding))}" for encoding in supported_encodings())
+        print(f"{count:>4} comments: identity {len(body)}, {sizes} bytes")
+
+
+if __name__ == "__main__":
+    _measure()
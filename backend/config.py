@@ -19,4 +19,39 @@ APP_SETTINGS = {
     "default_admin_username": os.getenv("DEFAULT_ADMIN_USERNAME", "admin"),
     "default_admin_password": os.getenv("DEFAULT_ADMIN_PASSWORD", "admin123"),
     "hexo_api_base": os.getenv("HEX0_API_BASE", "http://localhost:8000"),
+    # 超过该字节数的 API 响应按 Accept-Encoding 压缩（br 优先，其次 gzip）。
+    "compression_min_size": int(os.getenv("COMPRESSION_MIN_SIZE", "1024")),
+    "compression_gzip_level": int(os.getenv("COMPRESSION_GZIP_LEVEL", "6")),
+    "compression_brotli_quality": int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5")),
+    # 冷热分离：后台任务把过期的软删除评论和老文章的评论移入 comments_archive，间隔为 0 表示不启动后台任务。
+    "archive_interval_seconds": int(os.getenv("ARCHIVE_INTERVAL_SECONDS", "3600")),
+    "archive_deleted_retention_days": int(os.getenv("ARCHIVE_DELETED_RETENTION_DAYS", "30")),
+    "archive_post_age_years": int(os.getenv("ARCHIVE_POST_AGE_YEARS", "3")),
+    "archive_post_inactive_days": int(os.getenv("ARCHIVE_POST_INACTIVE_DAYS", "365")),
+    "archive_batch_size": int(os.getenv("ARCHIVE_BATCH_SIZE", "200")),
+    # 令牌桶限流：每项写成 "突发容量/时间窗口秒数"，留空或 "0" 表示该维度不限流。
+    "rate_limit_enabled": os.getenv("RATE_LIMIT_ENABLED", "1") == "1",
+    # 前面有几层可信反向代理；0 表示忽略 X-Forwarded-For，直接使用 TCP 对端地址。
+    "rate_limit_trusted_proxies": int(os.getenv("RATE_LIMIT_TRUSTED_PROXIES", "0")),
+    "rate_limit_max_keys": int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000")),
+    "rate_limits": {
+        "comment": {
+            "user": os.getenv("RATE_LIMIT_COMMENT_USER", "5/60"),
+            "ip": os.getenv("RATE_LIMIT_COMMENT_IP", "20/60"),
+            "global": os.getenv("RATE_LIMIT_COMMENT_GLOBAL", "300/60"),
+        },
+        "like": {
+            "user": os.getenv("RATE_LIMIT_LIKE_USER", "30/60"),
+            "ip": os.getenv("RATE_LIMIT_LIKE_IP", "60/60"),
+            "global": os.getenv("RATE_LIMIT_LIKE_GLOBAL", "1200/60"),
+        },
+        "register": {
+            "ip": os.getenv("RATE_LIMIT_REGISTER_IP", "5/3600"),
+            "global": os.getenv("RATE_LIMIT_REGISTER_GLOBAL", "60/60"),
+        },
+        "login": {
+            "ip": os.getenv("RATE_LIMIT_LOGIN_IP", "10/60"),
+            "global": os.getenv("RATE_LIMIT_LOGIN_GLOBAL", "300/60"),
+        },
+    },
 }
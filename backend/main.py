@@ -3,32 +3,75 @@ from __future__ import annotations
 
 from pathlib import Path
 
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
+from backend import assets
 from backend.api import admin_api, comment_api, user_api
+from backend.compression import CompressionMiddleware
+from backend.config import APP_SETTINGS
+from backend.services import archive_service
 
 APP_ROOT = Path(__file__).resolve().parent
 
 templates = Jinja2Templates(directory=str(APP_ROOT / "templates"))
 
 app = FastAPI(title="Hexo Comment Service", version="1.0.0")
+app.add_middleware(CompressionMiddleware, minimum_size=APP_SETTINGS["compression_min_size"])
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Retry-After"],
 )
 app.include_router(user_api.router)
 app.include_router(comment_api.router)
 app.include_router(admin_api.router)
 
+
+@app.get("/static/loader.js")
+async def widget_loader() -> Response:
+    return Response(
+        assets.loader_script(APP_SETTINGS["hexo_api_base"]),
+        media_type="application/javascript",
+        headers={"Cache-Control": "public, max-age=300"},
+    )
+
+
+@app.api_route("/static/comments.{digest}.js", methods=["GET", "HEAD"])
+async def fingerprinted_widget(digest: str, request: Request) -> Response:
+    widget = assets.widget_asset
+    # 部署后旧 loader.js 仍在缓存里、或多实例滚动发布时哈希不一致，都会请求别的版本。
+    # 这时直接返回本实例的当前版本但只短缓存，而不是 404 让评论区消失；
+    # 不用重定向，避免新旧实例之间来回跳转。
+    cache_control = assets.IMMUTABLE_CACHE_CONTROL if digest == widget.digest else "public, max-age=60"
+    encoding, body = widget.variant(request.headers.get("accept-encoding"))
+    etag = widget.etag(encoding)
+    headers = {"Cache-Control": cache_control, "ETag": etag, "Vary": "Accept-Encoding"}
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    if assets.etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(body, media_type="application/javascript", headers=headers)
+
+
 app.mount("/static", StaticFiles(directory=str(APP_ROOT / "static")), name="static")
 
 
+@app.on_event("startup")
+async def start_archiver() -> None:
+    archive_service.archiver_job.start()
+
+
+@app.on_event("shutdown")
+async def stop_archiver() -> None:
+    archive_service.archiver_job.stop()
+
+
 @app.get("/", response_class=HTMLResponse)
 async def index() -> str:
     return "<h3>Hexo Comment API is running.</h3>"
@@ -3,7 +3,7 @@ from __future__ import annotations
 
 from typing import Dict, List
 
-from backend.services import comment_service, user_service
+from backend.services import archive_service, comment_service, user_service
 
 
 def ensure_admin(role: str) -> None:
@@ -23,3 +23,11 @@ def create_admin(username: str, password: str) -> Dict[str, str]:
 
 def moderation_feed(include_deleted: bool = True) -> List[Dict[str, str]]:
     return comment_service.list_all_comments(include_deleted=include_deleted)
+
+
+def archived_feed(post_id: str) -> List[Dict[str, str]]:
+    return comment_service.list_archived_comments(post_id, include_deleted=True)
+
+
+def run_archiver() -> Dict[str, int]:
+    return archive_service.run_archiver()
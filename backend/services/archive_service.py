@@ -0,0 +1,173 @@
+"""Hot/cold split: move stale comments out of the hot ``comments`` table."""
+from __future__ import annotations
+
+import datetime
+import logging
+import threading
+from typing import Dict, Optional
+
+from backend.config import APP_SETTINGS
+from backend.db import database
+
+logger = logging.getLogger(__name__)
+
+# 软删除评论每批一个事务，限制行数让事务足够短；老文章按篇搬，这里只限制每次挑出的文章数，
+# 单篇文章的整棵回复树始终在一个事务里，评论很多的帖子会是一个较长的事务。
+MAX_BATCH_SIZE = 1000
+
+# 手动触发和后台定时任务共用，保证同一进程内不会同时跑两次
+_run_lock = threading.Lock()
+
+_MOVE_BATCH_STATEMENTS = (
+    "INSERT INTO comments_archive (id, post_id, user_id, content, created_at, is_deleted, deleted_at, parent_comment_id) "
+    "SELECT id, post_id, user_id, content, created_at, is_deleted, deleted_at, parent_comment_id "
+    "FROM comments WHERE id IN (SELECT id FROM #archive_batch)",
+    "INSERT INTO comment_likes_archive (comment_id, user_id, created_at) "
+    "SELECT comment_id, user_id, created_at FROM comment_likes WHERE comment_id IN (SELECT id FROM #archive_batch)",
+    "DELETE FROM comment_likes WHERE comment_id IN (SELECT id FROM #archive_batch)",
+    "DELETE FROM comments WHERE id IN (SELECT id FROM #archive_batch)",
+)
+
+
+def _move_batch(select_sql: str, params) -> int:
+    """在一个事务里把 select_sql 填入 #archive_batch 的评论连同点赞搬到归档表，返回搬走的评论数。"""
+    with database.get_connection() as conn:
+        cursor = conn.cursor()
+        # 带参数的语句经 sp_executesql 执行，在其中创建的临时表会随调用结束被删除，
+        # 所以先用不带参数的语句在会话级建表，再用参数化的 INSERT 填充。
+        cursor.execute("CREATE TABLE #archive_batch (id INT PRIMARY KEY)")
+        cursor.execute(select_sql, params)
+        moved = 0
+        for statement in _MOVE_BATCH_STATEMENTS:
+            cursor.execute(statement)
+            moved = cursor.rowcount
+        cursor.execute("DROP TABLE #archive_batch")
+        cursor.close()
+        return moved
+
+
+def archive_deleted_comments(retention_days: int, batch_size: int) -> int:
+    """归档删除时间早于保留期的软删除评论。
+
+    每批只搬没有子回复的评论，仍有回复挂在下面的已删除评论留在热表里维持回复链；
+    子回复被归档后它自己会在后续批次里变成叶子。
+    """
+    cutoff = datetime.datetime.now() - datetime.timedelta(days=retention_days)
+    select_sql = (
+        "INSERT INTO #archive_batch (id) SELECT TOP (?) c.id FROM comments c WITH (UPDLOCK, READPAST) "
+        "WHERE c.is_deleted = 1 AND ISNULL(c.deleted_at, c.created_at) < ? "
+        "AND NOT EXISTS (SELECT 1 FROM comments child WHERE child.parent_comment_id = c.id)"
+    )
+    total = 0
+    while True:
+        moved = _move_batch(select_sql, (min(batch_size, MAX_BATCH_SIZE), cutoff))
+        total += moved
+        if not moved:
+            return total
+
+
+def archive_old_posts(max_age_years: int, inactive_days: int, batch_size: int) -> int:
+    """整篇归档既老又不再活跃的文章的评论。
+
+    文章本身在 Hexo 里，用最早一条评论的时间近似发布时间；最近一条评论也要早于
+    inactive_days，避免还有人在讨论的帖子被搬成只读。
+    """
+    now = datetime.datetime.now()
+    age_cutoff = now - datetime.timedelta(days=365 * max_age_years)
+    inactive_cutoff = now - datetime.timedelta(days=inactive_days)
+    # 候选文章是在事务外挑出来的，搬之前在锁内重新确认“够老且仍不活跃”，
+    # 期间有新评论的文章一条都不搬；post_id 索引上的范围锁同时挡住本事务内新插入的评论。
+    select_sql = (
+        "INSERT INTO #archive_batch (id) SELECT id FROM comments WITH (UPDLOCK, HOLDLOCK) WHERE post_id = ? "
+        "AND EXISTS (SELECT 1 FROM comments WITH (UPDLOCK, HOLDLOCK) WHERE post_id = ? AND created_at < ?) "
+        "AND NOT EXISTS (SELECT 1 FROM comments WITH (UPDLOCK, HOLDLOCK) WHERE post_id = ? AND created_at >= ?)"
+    )
+    total = 0
+    while True:
+        rows = database.fetch_all(
+            "SELECT TOP (?) post_id FROM comments GROUP BY post_id "
+            "HAVING MIN(created_at) < ? AND MAX(created_at) < ?",
+            (min(batch_size, MAX_BATCH_SIZE), age_cutoff, inactive_cutoff),
+        )
+        if not rows:
+            return total
+        for row in rows:
+            # 一篇文章一个事务，整棵回复树一起搬走
+            params = (row.post_id, row.post_id, age_cutoff, row.post_id, inactive_cutoff)
+            total += _move_batch(select_sql, params)
+
+
+def run_archiver(
+    retention_days: Optional[int] = None,
+    post_age_years: Optional[int] = None,
+    post_inactive_days: Optional[int] = None,
+    batch_size: Optional[int] = None,
+) -> Dict[str, int]:
+    """运行一次归档；已有一次在运行时抛出 RuntimeError。"""
+    if not _run_lock.acquire(blocking=False):
+        raise RuntimeError("Archiver is already running")
+    try:
+        return _run_archiver(retention_days, post_age_years, post_inactive_days, batch_size)
+    finally:
+        _run_lock.release()
+
+
+def _run_archiver(
+    retention_days: Optional[int],
+    post_age_years: Optional[int],
+    post_inactive_days: Optional[int],
+    batch_size: Optional[int],
+) -> Dict[str, int]:
+    retention_days = APP_SETTINGS["archive_deleted_retention_days"] if retention_days is None else retention_days
+    post_age_years = APP_SETTINGS["archive_post_age_years"] if post_age_years is None else post_age_years
+    post_inactive_days = APP_SETTINGS["archive_post_inactive_days"] if post_inactive_days is None else post_inactive_days
+    batch_size = batch_size or APP_SETTINGS["archive_batch_size"]
+
+    result = {"deleted_comments": 0, "old_post_comments": 0}
+    if retention_days >= 0:
+        result["deleted_comments"] = archive_deleted_comments(retention_days, batch_size)
+    if post_age_years > 0:
+        result["old_post_comments"] = archive_old_posts(post_age_years, post_inactive_days, batch_size)
+    return result
+
+
+class ArchiverJob:
+    """按固定间隔在后台线程里运行 run_archiver()。"""
+
+    def __init__(self, interval_seconds: int) -> None:
+        self._interval = interval_seconds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._interval <= 0 or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="comment-archiver", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            try:
+                result = run_archiver()
+            except RuntimeError as exc:
+                logger.info("Skipping scheduled archiver run: %s", exc)
+                continue
+            except Exception:
+                logger.exception("Comment archiver run failed")
+                continue
+            if any(result.values()):
+                logger.info("Archived comments: %s", result)
+
+
+archiver_job = ArchiverJob(APP_SETTINGS["archive_interval_seconds"])
+
+
+if __name__ == "__main__":
+    print(run_archiver())
@@ -6,7 +6,7 @@ from typing import Dict, List, Optional, Sequence, Set
 from backend.db import database
 
 
-def _row_to_comment(row, liked_ids: Set[int]) -> Dict[str, object]:
+def _row_to_comment(row, liked_ids: Set[int], archived: bool = False) -> Dict[str, object]:
     return {
         "id": row.id,
         "post_id": row.post_id,
@@ -18,17 +18,19 @@ def _row_to_comment(row, liked_ids: Set[int]) -> Dict[str, object]:
         "parent_comment_id": row.parent_comment_id,
         "like_count": int(row.like_count or 0),
         "liked_by_viewer": row.id in liked_ids,
+        "is_archived": archived,
         "replies": [],
     }
 
 
-def _fetch_rows(post_id: Optional[str], include_deleted: bool) -> Sequence:
+def _fetch_rows(post_id: Optional[str], include_deleted: bool, archived: bool = False) -> Sequence:
+    comments_table, likes_table = ("comments_archive", "comment_likes_archive") if archived else ("comments", "comment_likes")
     sql = (
         "SELECT c.id, c.post_id, c.user_id, u.username, c.content, c.created_at, c.is_deleted, c.parent_comment_id, "
         "ISNULL(l.like_count, 0) AS like_count "
-        "FROM comments c "
+        f"FROM {comments_table} c "
         "INNER JOIN users u ON u.id = c.user_id "
-        "LEFT JOIN (SELECT comment_id, COUNT(*) AS like_count FROM comment_likes GROUP BY comment_id) l "
+        f"LEFT JOIN (SELECT comment_id, COUNT(*) AS like_count FROM {likes_table} GROUP BY comment_id) l "
         "ON l.comment_id = c.id "
     )
     conditions = []
@@ -54,12 +56,12 @@ def _fetch_liked_ids(comment_ids: List[int], viewer_id: Optional[int]) -> Set[in
     return {row.comment_id for row in rows}
 
 
-def _build_tree(rows, liked_ids: Set[int]) -> List[Dict[str, object]]:
+def _build_tree(rows, liked_ids: Set[int], archived: bool = False) -> List[Dict[str, object]]:
     comment_map: Dict[int, Dict[str, object]] = {}
     roots: List[Dict[str, object]] = []
 
     for row in rows:
-        comment_map[row.id] = _row_to_comment(row, liked_ids)
+        comment_map[row.id] = _row_to_comment(row, liked_ids, archived)
 
     for comment in comment_map.values():
         parent_id = comment["parent_comment_id"]
@@ -81,6 +83,12 @@ def list_comments(post_id: str, include_deleted: bool = False, viewer_id: Option
     return _build_tree(rows, liked_ids)
 
 
+def list_archived_comments(post_id: str, include_deleted: bool = False) -> List[Dict[str, object]]:
+    """按需读取已归档的评论树（只读，不带当前用户的点赞状态）。"""
+    rows = _fetch_rows(post_id, include_deleted, archived=True)
+    return _build_tree(rows, liked_ids=set(), archived=True)
+
+
 def list_all_comments(include_deleted: bool = True) -> List[Dict[str, object]]:
     rows = _fetch_rows(post_id=None, include_deleted=include_deleted)
     return _build_tree(rows, liked_ids=set())
@@ -109,7 +117,7 @@ def add_comment(post_id: str, user_id: int, content: str, parent_comment_id: Opt
 
 
 def soft_delete_comment(comment_id: int) -> int:
-    return database.execute("UPDATE comments SET is_deleted = 1 WHERE id = ?", (comment_id,))
+    return database.execute("UPDATE comments SET is_deleted = 1, deleted_at = ISNULL(deleted_at, SYSDATETIME()) WHERE id = ?", (comment_id,))
 
 
 def toggle_like(comment_id: int, user_id: int) -> Dict[str, object]:
@@ -0,0 +1,165 @@
+"""Token-bucket admission control for write-heavy endpoints."""
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from backend.config import APP_SETTINGS
+
+# (bucket key, capacity, refill tokens per second)
+BucketSpec = Tuple[str, float, float]
+
+SCOPES = ("user", "ip", "global")
+
+
+def parse_rate(spec: Optional[str]) -> Optional[Tuple[float, float]]:
+    """把 "容量/秒数" 解析为 (capacity, refill_per_second)；空值或 0 表示不限流。"""
+    if not spec or not spec.strip():
+        return None
+    try:
+        burst_text, _, window_text = spec.partition("/")
+        burst = float(burst_text)
+        window = float(window_text) if window_text else 1.0
+    except ValueError as exc:
+        raise ValueError(f"Invalid rate limit spec: {spec!r}") from exc
+    if burst <= 0:
+        return None
+    if window <= 0:
+        raise ValueError(f"Invalid rate limit spec: {spec!r}")
+    return burst, burst / window
+
+
+class InMemoryBucketStore:
+    """进程内令牌桶存储；多 worker 部署时可替换为实现同样 acquire() 的共享存储。"""
+
+    def __init__(self, max_keys: int) -> None:
+        self._max_keys = max_keys
+        self._buckets: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, specs: Sequence[BucketSpec], now: Optional[float] = None) -> Tuple[float, int]:
+        """所有桶都有余量时各扣一个令牌并返回 (0, -1)；否则不扣，返回 (需等待秒数, 等待最久的桶下标)。"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            states = []
+            retry_after = 0.0
+            blocked = -1
+            for index, (key, capacity, refill) in enumerate(specs):
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    bucket = [capacity, now]
+                    self._buckets[key] = bucket
+                    if len(self._buckets) > self._max_keys:
+                        self._buckets.popitem(last=False)
+                else:
+                    self._buckets.move_to_end(key)
+                    bucket[0] = min(capacity, bucket[0] + (now - bucket[1]) * refill)
+                    bucket[1] = now
+                if bucket[0] < 1.0:
+                    wait = (1.0 - bucket[0]) / refill
+                    if wait > retry_after:
+                        retry_after, blocked = wait, index
+                states.append(bucket)
+            if blocked >= 0:
+                return retry_after, blocked
+            for bucket in states:
+                bucket[0] -= 1.0
+            return 0.0, -1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+class RateLimiter:
+    def __init__(self, limits: Dict[str, Dict[str, str]], store, enabled: bool = True) -> None:
+        self._enabled = enabled
+        self._store = store
+        self._limits: Dict[str, Dict[str, Tuple[float, float]]] = {}
+        for action, scopes in limits.items():
+            parsed = {}
+            for scope, spec in scopes.items():
+                if scope not in SCOPES:
+                    raise ValueError(f"Unknown rate limit scope: {scope}")
+                rate = parse_rate(spec)
+                if rate:
+                    parsed[scope] = rate
+            self._limits[action] = parsed
+        self._rejections: Dict[str, Dict[str, int]] = {
+            action: {scope: 0 for scope in scopes} for action, scopes in self._limits.items()
+        }
+        self._allowed: Dict[str, int] = {action: 0 for action in self._limits}
+        self._stats_lock = threading.Lock()
+
+    def check(self, action: str, user_id: Optional[int] = None, client_ip: Optional[str] = None) -> float:
+        """返回 0 表示放行，否则返回建议的 Retry-After 秒数。"""
+        limits = self._limits.get(action)
+        if not self._enabled or not limits:
+            return 0.0
+
+        identities = {"user": user_id, "ip": client_ip, "global": "*"}
+        specs: List[BucketSpec] = []
+        scopes: List[str] = []
+        for scope, (capacity, refill) in limits.items():
+            identity = identities[scope]
+            if identity is None:
+                continue
+            specs.append((f"{action}:{scope}:{identity}", capacity, refill))
+            scopes.append(scope)
+        if not specs:
+            return 0.0
+
+        retry_after, blocked = self._store.acquire(specs)
+        with self._stats_lock:
+            if blocked < 0:
+                self._allowed[action] += 1
+            else:
+                self._rejections[action][scopes[blocked]] += 1
+        return retry_after
+
+    def stats(self) -> Dict[str, Dict[str, object]]:
+        with self._stats_lock:
+            return {
+                action: {"allowed": self._allowed[action], "rejected": dict(self._rejections[action])}
+                for action in self._limits
+            }
+
+    def reset(self) -> None:
+        self._store.clear()
+        with self._stats_lock:
+            for action in self._limits:
+                self._allowed[action] = 0
+                self._rejections[action] = {scope: 0 for scope in self._limits[action]}
+
+
+def retry_after_header(seconds: float) -> str:
+    return str(max(1, math.ceil(seconds)))
+
+
+rate_limiter = RateLimiter(
+    APP_SETTINGS["rate_limits"],
+    InMemoryBucketStore(APP_SETTINGS["rate_limit_max_keys"]),
+    enabled=APP_SETTINGS["rate_limit_enabled"],
+)
+
+
+def _benchmark(iterations: int = 200_000) -> None:
+    """粗略测量 check() 的单次开销：python -m backend.services.rate_limit_service"""
+    for key_count in (1, 1_000, 100_000):
+        limiter = RateLimiter(
+            {"comment": {"user": "1000000/1", "ip": "1000000/1", "global": "1000000000/1"}},
+            InMemoryBucketStore(max_keys=key_count),
+        )
+        started = time.perf_counter()
+        for i in range(iterations):
+            identity = i % key_count
+            limiter.check("comment", user_id=identity, client_ip=f"10.0.{identity >> 8 & 255}.{identity & 255}")
+        elapsed = time.perf_counter() - started
+        print(f"{key_count:>7} keys: {elapsed / iterations * 1e6:.2f} us/check")
+
+
+if __name__ == "__main__":
+    _benchmark()
@@ -38,12 +38,16 @@
             <textarea id="hx-comment-input" rows="4" placeholder="写下你的想法..."></textarea>
             <button id="hx-submit">发布评论</button>
             <div class="hx-list" id="hx-list"></div>
+            <button id="hx-archive-button">查看归档评论</button>
+            <div class="hx-list" id="hx-archive-list"></div>
         </div>
     `;
     root.innerHTML = html;
 
     const statusEl = document.getElementById('hx-status');
     const listEl = document.getElementById('hx-list');
+    const archiveButton = document.getElementById('hx-archive-button');
+    const archiveListEl = document.getElementById('hx-archive-list');
     const commentInput = document.getElementById('hx-comment-input');
     const loginUser = document.getElementById('hx-login-username');
     const loginPass = document.getElementById('hx-login-password');
@@ -64,6 +68,10 @@
 
     async function fetchJSON(url, options) {
         const response = await fetch(url, options);
+        if (response.status === 429) {
+            const retryAfter = response.headers.get('Retry-After');
+            throw new Error(retryAfter ? `操作过于频繁，请在 ${retryAfter} 秒后重试` : '操作过于频繁，请稍后再试');
+        }
         if (!response.ok) {
             throw new Error((await response.text()) || '请求失败');
         }
@@ -86,6 +94,21 @@
         }
     }
 
+    async function loadArchivedComments() {
+        setStatus('正在加载归档评论...');
+        try {
+            const data = await fetchJSON(`${apiBase}/api/comments/archive?post_id=${encodeURIComponent(postId)}`);
+            const items = data.items || [];
+            archiveButton.style.display = 'none';
+            archiveListEl.innerHTML = items.length ? '' : '<p>没有归档评论。</p>';
+            items.forEach(item => renderComment(item, archiveListEl));
+            setStatus('');
+        } catch (err) {
+            setStatus('加载归档评论失败');
+            console.error(err);
+        }
+    }
+
     function renderComments(items) {
         listEl.innerHTML = '';
         if (!items.length) {
@@ -118,11 +141,16 @@
         actions.appendChild(replyBtn);
         container.appendChild(header);
         container.appendChild(body);
-        container.appendChild(actions);
         parent.appendChild(container);
 
-        likeBtn.addEventListener('click', () => handleLike(item.id));
-        replyBtn.addEventListener('click', () => handleReply(item));
+        // 归档评论只读，不提供点赞和回复
+        if (item.is_archived) {
+            header.textContent += ` • 👍 ${item.like_count}`;
+        } else {
+            container.appendChild(actions);
+            likeBtn.addEventListener('click', () => handleLike(item.id));
+            replyBtn.addEventListener('click', () => handleReply(item));
+        }
 
         if (item.replies && item.replies.length) {
             const repliesContainer = document.createElement('div');
@@ -239,6 +267,7 @@
     document.getElementById('hx-login-button').addEventListener('click', () => handleAuth('login'));
     document.getElementById('hx-register-button').addEventListener('click', () => handleAuth('register'));
     document.getElementById('hx-submit').addEventListener('click', submitComment);
+    archiveButton.addEventListener('click', loadArchivedComments);
 
     loadComments();
 })();
@@ -71,6 +71,19 @@ def ensure_tables():
         ALTER TABLE comments ADD parent_comment_id INT NULL FOREIGN KEY REFERENCES comments(id)
         """
     )
+    # 按文章读取、归档时锁定单篇文章都依赖这个索引，否则只能扫全表
+    cursor.execute(
+        """
+        IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_comments_post_id')
+        CREATE INDEX IX_comments_post_id ON comments (post_id, created_at)
+        """
+    )
+    cursor.execute(
+        """
+        IF COL_LENGTH('comments', 'deleted_at') IS NULL
+        ALTER TABLE comments ADD deleted_at DATETIME2 NULL
+        """
+    )
     cursor.execute(
         """
         IF OBJECT_ID('comment_likes', 'U') IS NULL
@@ -83,6 +96,40 @@ def ensure_tables():
         )
         """
     )
+    # 冷数据表：没有指向 comments 的外键，父评论可能仍留在热表中
+    cursor.execute(
+        """
+        IF OBJECT_ID('comments_archive', 'U') IS NULL
+        CREATE TABLE comments_archive (
+            id INT NOT NULL PRIMARY KEY,
+            post_id NVARCHAR(255) NOT NULL,
+            user_id INT NOT NULL FOREIGN KEY REFERENCES users(id),
+            content NVARCHAR(MAX) NOT NULL,
+            created_at DATETIME2 NOT NULL,
+            is_deleted BIT NOT NULL,
+            deleted_at DATETIME2 NULL,
+            parent_comment_id INT NULL,
+            archived_at DATETIME2 NOT NULL DEFAULT SYSDATETIME()
+        )
+        """
+    )
+    cursor.execute(
+        """
+        IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_comments_archive_post_id')
+        CREATE INDEX IX_comments_archive_post_id ON comments_archive (post_id)
+        """
+    )
+    cursor.execute(
+        """
+        IF OBJECT_ID('comment_likes_archive', 'U') IS NULL
+        CREATE TABLE comment_likes_archive (
+            comment_id INT NOT NULL FOREIGN KEY REFERENCES comments_archive(id) ON DELETE CASCADE,
+            user_id INT NOT NULL FOREIGN KEY REFERENCES users(id) ON DELETE CASCADE,
+            created_at DATETIME2 NOT NULL,
+            CONSTRAINT PK_comment_likes_archive PRIMARY KEY (comment_id, user_id)
+        )
+        """
+    )
     conn.commit()
     cursor.close()
     conn.close()